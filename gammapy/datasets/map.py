@@ -693,9 +693,9 @@ class MapDataset(Dataset):
             npred_spec = npred.get_spectrum(region=region)
             residuals = self._compute_residuals(counts_spec, npred_spec, method)
             if method == "diff":
-                yerr = np.sqrt((counts_spec.data + npred_spec.data).flatten())
+                yerr = np.sqrt((counts_spec.data + npred_spec.data).ravel())
             else:
-                yerr = np.ones_like(residuals.data.flatten())
+                yerr = np.ones_like(residuals.data.ravel())
             ax = residuals.plot(color="black", yerr=yerr, fmt=".", capsize=2, lw=1)
             ax.set_yscale("linear")
             ax.axhline(0, color="black", lw=0.5)
@@ -14,7 +14,7 @@ from gammapy.stats import (
     CashCountsStatistic,
     WStatCountsStatistic,
     cash,
-    wstat,
+    wstat_cython,
     get_wstat_mu_bkg,
 )
 from gammapy.utils.random import get_random_state
@@ -92,6 +92,8 @@ class SpectrumDataset(Dataset):
         self.meta_table = meta_table
 
         self._name = make_name(name)
+        self._models_version = 0
+        self._evaluators_version = None
         self.models = models
 
     @property
@@ -105,13 +107,16 @@ class SpectrumDataset(Dataset):
 
         str_ += "\t{:32}: {} \n\n".format("Name", self.name)
 
+        # collect the models once, each access creates a new `ProperModels`
+        models = self.models
+
         counts = np.nan
         if self.counts is not None:
             counts = np.sum(self.counts.data)
         str_ += "\t{:32}: {:.0f} \n".format("Total counts", counts)
 
         npred = np.nan
-        if self.models is not None:
+        if models is not None:
             npred = np.sum(self.npred().data)
         str_ += "\t{:32}: {:.2f}\n".format("Total predicted counts", npred)
 
@@ -121,11 +126,14 @@ class SpectrumDataset(Dataset):
         str_ += "\t{:32}: {:.2f}\n\n".format("Total background counts", background)
 
         exposure_min, exposure_max, exposure_unit = np.nan, np.nan, ""
-        non_zero = self.exposure.data > 0
-        if self.exposure is not None and non_zero.any():
-            exposure_min = np.min(self.exposure.data[non_zero])
-            exposure_max = np.max(self.exposure.data)
-            exposure_unit = self.exposure.unit
+        if self.exposure is not None:
+            exposure = self.exposure.data
+            non_zero = exposure > 0
+
+            if non_zero.any():
+                exposure_min = np.min(exposure, where=non_zero, initial=np.inf)
+                exposure_max = np.max(exposure)
+                exposure_unit = self.exposure.unit
 
         str_ += "\t{:32}: {:.2e} {}\n".format("Exposure min", exposure_min, exposure_unit)
         str_ += "\t{:32}: {:.2e} {}\n\n".format(
@@ -147,50 +155,81 @@ class SpectrumDataset(Dataset):
         str_ += "\t{:32}: {}\n".format("Fit statistic type", self.stat_type)
 
         stat = np.nan
-        if self.models is not None and self.counts is not None:
+        if models is not None and self.counts is not None:
             stat = self.stat_sum()
         str_ += "\t{:32}: {:.2f}\n\n".format("Fit statistic value (-2 log(L))", stat)
 
         n_pars, n_free_pars = 0, 0
-        if self.models is not None:
-            n_pars = len(self.models.parameters)
-            n_free_pars = len(self.models.parameters.free_parameters)
+        if models is not None:
+            parameters = models.parameters
+            n_pars = len(parameters)
+            n_free_pars = len(parameters.free_parameters)
 
         str_ += "\t{:32}: {}\n".format("Number of parameters", n_pars)
         str_ += "\t{:32}: {}\n\n".format("Number of free parameters", n_free_pars)
 
-        if self.models is not None:
-            str_ += "\t" + "\n\t".join(str(self.models).split("\n")[2:])
+        if models is not None:
+            str_ += "\t" + "\n\t".join(str(models).split("\n")[2:])
 
         return str_.expandtabs(tabsize=2)
 
     @property
     def evaluators(self):
         """Model evaluators"""
+        evaluators = self._update_evaluators().values()
+        return {evaluator.model: evaluator for evaluator in evaluators}
+
+    def _update_evaluators(self):
+        """Update the model evaluators and return them keyed by ``id(model)``"""
+        models = self.models
+
+        # the models only change together with the version counter
+        if self._evaluators_version == self._models_version:
+            return self._evaluators
+
+        ids = [id(model) for model in models]
+        for key in set(self._evaluators).difference(ids):
+            del self._evaluators[key]
+
+        edisp = None
+        for key, model in zip(ids, models):
+            if key not in self._evaluators:
+                # the edisp kernel is only needed for new evaluators
+                if edisp is None:
+                    edisp = self._edisp_kernel
+
+                self._evaluators[key] = MapEvaluator(
+                    model=model, exposure=self.exposure, edisp=edisp, gti=self.gti,
+                )
 
-        edisp = self._edisp_kernel
-
-        if self.models:
-            for model in self.models:
-                evaluator = self._evaluators.get(model)
-
-                if evaluator is None:
-                    evaluator = MapEvaluator(
-                        model=model, exposure=self.exposure, edisp=edisp, gti=self.gti,
-                    )
-                    self._evaluators[model] = evaluator
-
-        keys = list(self._evaluators.keys())
-        for key in keys:
-            if key not in self.models:
-                del self._evaluators[key]
-
+        self._evaluators_version = self._models_version
         return self._evaluators
 
     @property
     def models(self):
         """Models (`gammapy.modeling.models.Models`)."""
-        return ProperModels(self)
+        key = self._proper_models_key
+
+        if self._proper_models is None or key != self._cached_proper_models_key:
+            self._proper_models = ProperModels(self)
+            self._models_version += 1
+            # `ProperModels` can initialise `_models`, so the key is updated after
+            self._cached_proper_models_key = self._proper_models_key
+
+        return self._proper_models
+
+    @property
+    def _proper_models_key(self):
+        """Models and dataset names the `ProperModels` selection depends on"""
+        if self._models is None:
+            return None
+
+        key = [self.name]
+        for model in self._models:
+            names = model.datasets_names
+            key.append((id(model), names if names is None else tuple(names)))
+
+        return key
 
     @property
     def background_model(self):
@@ -198,6 +237,9 @@ class SpectrumDataset(Dataset):
 
     @models.setter
     def models(self, models):
+        self._proper_models = None
+        self._cached_proper_models_key = None
+
         if models is None:
             self._models = None
         else:
@@ -214,12 +256,17 @@ class SpectrumDataset(Dataset):
             if not isinstance(self, SpectrumDatasetOnOff):
                 log.warning(f"No background model defined for dataset {self.name}")
         self._evaluators = {}
+        self._models_version += 1
+        self._cached_npred = None
+        self._cached_npred_key = None
 
     @property
     def mask_safe(self):
         if self._mask_safe is None:
-            data = np.ones(self._geom.data_shape, dtype=bool)
-            return RegionNDMap.from_geom(self._geom, data=data)
+            # read-only all-true view, no allocation needed
+            geom = self._geom
+            data = np.broadcast_to(True, geom.data_shape)
+            return RegionNDMap.from_geom(geom, data=data)
         else:
             return self._mask_safe
 
@@ -264,13 +311,33 @@ class SpectrumDataset(Dataset):
 
     def npred(self):
         """Predicted counts from source and background model (`RegionNDMap`)."""
-        npred_total = RegionNDMap.from_geom(self._geom)
+        key = self._npred_key()
+        cached_key = self._cached_npred_key
+
+        if (
+            self._cached_npred is None
+            or key[0] != cached_key[0]
+            or not np.array_equal(key[1], cached_key[1])
+        ):
+            npred_total = RegionNDMap.from_geom(self._geom)
+
+            for evaluator in self._update_evaluators().values():
+                npred = evaluator.compute_npred()
+                npred_total.stack(npred)
+
+            # the key is only stored once the evaluation succeeded
+            self._cached_npred, self._cached_npred_key = npred_total, key
 
-        for evaluator in self.evaluators.values():
-            npred = evaluator.compute_npred()
-            npred_total.stack(npred)
+        # the geometry is shared, only the data of the cached map is copied
+        npred = self._cached_npred
+        return RegionNDMap.from_geom(
+            npred.geom, data=npred.data.copy(), unit=npred.unit
+        )
 
-        return npred_total
+    def _npred_key(self):
+        """Models and parameter values the predicted counts depend on"""
+        models = self.models
+        return [id(model) for model in models], models.parameters.values
 
     def npred_sig(self, model=None):
         """"Model predicted signal counts. If a model is passed, predicted counts from that component is returned.
@@ -292,12 +359,23 @@ class SpectrumDataset(Dataset):
                 return self.npred()
             return self.npred() - self.background_model.evaluate()
         else:
-            return self.evaluators.get(model).compute_npred()
+            return self._update_evaluators().get(id(model)).compute_npred()
 
     def stat_array(self):
         """Likelihood per bin given the current model parameters"""
         return cash(n_on=self.counts.data, mu_on=self.npred().data)
 
+    def stat_sum(self):
+        """Total likelihood given the current model parameters."""
+        counts, npred, mask = self.counts.data, self.npred().data, self.mask
+
+        # only the bins in the mask are evaluated, the numpy pairwise sum keeps
+        # the result identical to summing the masked `stat_array`
+        if mask is not None:
+            counts, npred = counts[mask.data], npred[mask.data]
+
+        return np.sum(cash(n_on=counts, mu_on=npred), dtype=np.float64)
+
     @property
     def excess(self):
         return self.counts - self.background_model.evaluate()
@@ -323,16 +401,15 @@ class SpectrumDataset(Dataset):
     def energy_range(self):
         """Energy range defined by the safe mask"""
         energy = self._energy_axis.edges
-        e_min, e_max = energy[:-1], energy[1:]
+        mask = self.mask_safe.data[:, 0, 0]
 
-        if self.mask_safe is not None:
-            if self.mask_safe.data.any():
-                e_min = e_min[self.mask_safe.data[:, 0, 0]]
-                e_max = e_max[self.mask_safe.data[:, 0, 0]]
-            else:
-                return None, None
+        if not mask.any():
+            return None, None
 
-        return u.Quantity([e_min.min(), e_max.max()])
+        # edges are increasing, so the range is given by the first and last safe bin
+        idx_min = np.argmax(mask)
+        idx_max = mask.size - np.argmax(mask[::-1])
+        return u.Quantity([energy[idx_min], energy[idx_max]])
 
     def plot_fit(self):
         """Plot counts and residuals in two panels.
@@ -380,11 +457,11 @@ class SpectrumDataset(Dataset):
 
         ax = plt.gca() if ax is None else ax
         self._plot_energy_range(ax=ax)
-        self.excess.plot(
-            ax=ax,
-            label="Measured excess",
-            yerr=np.sqrt(np.abs(self.excess.data.flatten())),
-        )
+
+        excess = self.excess
+        yerr = np.abs(excess.data.ravel())
+        np.sqrt(yerr, out=yerr)
+        excess.plot(ax=ax, label="Measured excess", yerr=yerr)
         self.npred_sig().plot_hist(ax=ax, label="Predicted signal counts")
 
         ax.legend(numpoints=1)
@@ -407,9 +484,14 @@ class SpectrumDataset(Dataset):
         residuals : `RegionNDMap`
             Residual spectrum
         """
+        residuals, _ = self._residuals_and_npred(method=method)
+        return residuals
+
+    def _residuals_and_npred(self, method="diff"):
+        """Residual spectrum together with the npred it was computed from"""
         npred = self.npred()
         residuals = self._compute_residuals(self.counts, npred, method)
-        return residuals
+        return residuals, npred
 
     def plot_residuals(self, method="diff", ax=None, **kwargs):
         """Plot residuals.
@@ -432,13 +514,14 @@ class SpectrumDataset(Dataset):
 
         ax = plt.gca() if ax is None else ax
 
-        residuals = self.residuals(method=method)
+        residuals, npred = self._residuals_and_npred(method=method)
         label = self._residuals_labels[method]
 
         if method == "diff":
-            yerr = np.sqrt((self.counts.data + self.npred().data).flatten())
+            yerr = np.add(self.counts.data, npred.data, dtype=float).ravel()
+            np.sqrt(yerr, out=yerr)
         else:
-            yerr = np.ones_like(residuals.data.flatten())
+            yerr = np.ones_like(residuals.data.ravel())
         residuals.plot(ax=ax, color="black", yerr=yerr, **kwargs)
         ax.axhline(0, color="black", lw=0.5)
 
@@ -446,8 +529,10 @@ class SpectrumDataset(Dataset):
         ax.set_ylabel(f"Residuals ({label})")
         ax.set_yscale("linear")
 
-        ymax = 1.05 * np.nanmax(residuals.data + yerr.data)
-        ymin = 1.05 * np.nanmin(residuals.data - yerr.data)
+        # use flat arrays, so that the bounds are computed per bin
+        residuals_data = residuals.data.ravel()
+        ymax = 1.05 * np.nanmax(residuals_data + yerr)
+        ymin = 1.05 * np.nanmin(residuals_data - yerr)
         ax.set_ylim(ymin, ymax)
         return ax
 
@@ -550,13 +635,22 @@ class SpectrumDataset(Dataset):
         if not isinstance(other, SpectrumDataset):
             raise TypeError("Incompatible types for SpectrumDataset stacking")
 
+        # apply the safe mask in-place on the data arrays, to avoid the
+        # temporary quantities and geometry checks of the map arithmetics
+        mask_safe = self.mask_safe.data
+
         if self.counts is not None:
-            self.counts *= self.mask_safe
-            self.counts.stack(other.counts, weights=other.mask_safe)
+            # the safe masks are boolean, so the weighted sum reduces to a
+            # masked in-place add, without a temporary weighted array
+            counts = self.counts.data.astype(float, copy=False)
+            self.counts.data = counts
+            np.multiply(counts, mask_safe, out=counts)
+            np.add(counts, other.counts.data, out=counts, where=other.mask_safe.data)
 
         if self.stat_type == "cash":
             if self.background_model and other.background_model:
-                self._background_model.map *= self.mask_safe
+                bkg_data = self._background_model.map.data
+                np.multiply(bkg_data, mask_safe, out=bkg_data)
                 self._background_model.stack(other.background_model, other.mask_safe)
                 self.models = Models([self.background_model])
         else:
@@ -573,11 +667,13 @@ class SpectrumDataset(Dataset):
                     self.exposure.meta["livetime"] = other.exposure.meta["livetime"]
 
         if self.edisp is not None and other.edisp is not None:
-            self.edisp.edisp_map *= self.mask_safe.data
+            edisp_data = self.edisp.edisp_map.data
+            np.multiply(edisp_data, mask_safe, out=edisp_data)
             self.edisp.stack(other.edisp, weights=other.mask_safe)
 
-        if self.mask_safe is not None and other.mask_safe is not None:
-            self.mask_safe.stack(other.mask_safe)
+        # an undefined safe mask is true everywhere and stays so when stacked
+        if self._mask_safe is not None:
+            self._mask_safe.stack(other.mask_safe)
 
         if self.gti is not None and other.gti is not None:
             self.gti.stack(other.gti)
@@ -637,24 +733,27 @@ class SpectrumDataset(Dataset):
             Dictionary with summary info.
         """
         info = dict()
-        mask = self.mask_safe.data if in_safe_energy_range else slice(None)
+        # masked reductions, without gathering the selected bins into new arrays
+        mask = self.mask_safe.data if in_safe_energy_range else True
 
         info["name"] = self.name
         if self.gti:
             info["livetime"] = self.gti.time_sum
 
-        info["n_on"] = self.counts.data[mask].sum()
+        n_on = np.sum(self.counts.data, where=mask)
+        info["n_on"] = n_on
 
         if self.background_model:
-            background = self.background_model.evaluate().data[mask].sum()
+            background = np.sum(self.background_model.evaluate().data, where=mask)
+            # the excess is defined as counts - background model
+            excess = n_on - background
         elif self.background:
-            background = self.background.data[mask].sum()
+            background = np.sum(self.background.data, where=mask)
+            excess = np.sum(self.excess.data, where=mask)
 
         info["background"] = background
-        info["excess"] = self.excess.data[mask].sum()
-        info["significance"] = CashCountsStatistic(
-            self.counts.data[mask].sum(), background
-        ).significance
+        info["excess"] = excess
+        info["significance"] = CashCountsStatistic(n_on, background).significance
 
         if self.gti:
             info["background_rate"] = info["background"] / info["livetime"]
@@ -699,8 +798,8 @@ class SpectrumDataset(Dataset):
         if self.edisp is not None:
             kwargs["edisp"] = self.edisp.slice_by_idx(slices=slices)
 
-        if self.mask_safe is not None:
-            kwargs["mask_safe"] = self.mask_safe.slice_by_idx(slices=slices)
+        if self._mask_safe is not None:
+            kwargs["mask_safe"] = self._mask_safe.slice_by_idx(slices=slices)
 
         if self.mask_fit is not None:
             kwargs["mask_fit"] = self.mask_fit.slice_by_idx(slices=slices)
@@ -731,20 +830,26 @@ class SpectrumDataset(Dataset):
         kwargs["gti"] = self.gti
         kwargs["exposure"] = self.exposure
 
-        # Adapt resample_axis to take ufunc argument
-        kwargs["mask_safe"] = self.mask_safe.resample_axis(
-            axis=energy_axis, ufunc=np.logical_or
+        # the resampled geometry and bin indices are shared by all maps
+        geom = self._geom.resample_axis(energy_axis)
+        axis = self._geom.axes["energy"]
+        indices = axis.coord_to_idx(geom.axes["energy"].edges[:-1])
+        resample_kwargs = {"geom": geom, "name": "energy", "indices": indices}
+
+        mask_safe = self.mask_safe
+        kwargs["mask_safe"] = mask_safe._resample_axis(
+            ufunc=np.logical_or, **resample_kwargs
         )
 
         if self.counts is not None:
-            kwargs["counts"] = self.counts.resample_axis(
-                axis=energy_axis, weights=self.mask_safe
+            kwargs["counts"] = self.counts._resample_axis(
+                weights=mask_safe, **resample_kwargs
             )
 
         if self.background_model is not None:
             background = self.background_model.evaluate()
-            background = background.resample_axis(
-                axis=energy_axis, weights=self.mask_safe
+            background = background._resample_axis(
+                weights=mask_safe, **resample_kwargs
             )
             model = BackgroundModel(
                 background, datasets_names=[name], name=f"{name}-bkg"
@@ -753,7 +858,7 @@ class SpectrumDataset(Dataset):
 
         if self.edisp is not None:
             kwargs["edisp"] = self.edisp.resample_energy_axis(
-                energy_axis=energy_axis, weights=self.mask_safe
+                energy_axis=energy_axis, weights=mask_safe
             )
 
         return self.__class__(**kwargs)
@@ -847,18 +952,20 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         self.meta_table = meta_table
 
         if np.isscalar(acceptance):
-            data = np.ones(self._geom.data_shape) * acceptance
+            data = np.full(self._geom.data_shape, acceptance, dtype=float)
             acceptance = RegionNDMap.from_geom(self._geom, data=data)
 
         self.acceptance = acceptance
 
         if np.isscalar(acceptance_off):
-            data = np.ones(self._geom.data_shape) * acceptance_off
+            data = np.full(self._geom.data_shape, acceptance_off, dtype=float)
             acceptance_off = RegionNDMap.from_geom(self._geom, data=data)
 
         self.acceptance_off = acceptance_off
 
         self._evaluators = {}
+        self._models_version = 0
+        self._evaluators_version = None
         self._name = make_name(name)
         self.gti = gti
         self.models = models
@@ -904,19 +1011,39 @@ class SpectrumDatasetOnOff(SpectrumDataset):
     @property
     def counts_off_normalised(self):
         """ alpha * noff"""
-        return self.alpha * self.counts_off
+        alpha = self.alpha
+        data = np.multiply(alpha.data, self.counts_off.data)
+        return RegionNDMap.from_geom(alpha.geom, data=data)
 
     @property
     def excess(self):
         """counts - alpha * off"""
-        return self.counts - self.counts_off_normalised
+        excess = np.multiply(self.alpha.data, self.counts_off.data)
+        np.subtract(self.counts.data, excess, out=excess)
+        return RegionNDMap.from_geom(self._geom, data=excess)
 
     @property
     def alpha(self):
         """Exposure ratio between signal and background regions"""
-        alpha = self.acceptance / self.acceptance_off
-        np.nan_to_num(alpha.data, copy=False)
-        return alpha
+        acceptance, acceptance_off = self.acceptance.data, self.acceptance_off.data
+
+        # bins without OFF acceptance get the values `np.nan_to_num` gives for a
+        # division by zero: zero or the largest finite float, with the ON sign
+        shape = np.broadcast(acceptance, acceptance_off).shape
+        data = np.sign(acceptance) * np.finfo(float).max
+        data = np.broadcast_to(data, shape).astype(float)
+        np.divide(
+            acceptance,
+            acceptance_off,
+            out=data,
+            where=acceptance_off != 0,
+            dtype=float,
+        )
+        return RegionNDMap.from_geom(
+            self.acceptance.geom,
+            data=data,
+            unit=self.acceptance.unit / self.acceptance_off.unit,
+        )
 
     def npred_sig(self, model=None):
         """"Model predicted signal counts. If a model is passed, predicted counts from that component is returned.
@@ -959,14 +1086,16 @@ class SpectrumDatasetOnOff(SpectrumDataset):
 
     def stat_array(self):
         """Likelihood per bin given the current model parameters"""
-        mu_sig = self.npred_sig().data
-        on_stat_ = wstat(
-            n_on=self.counts.data,
-            n_off=self.counts_off.data,
-            alpha=self.alpha.data,
-            mu_sig=mu_sig,
-        )
-        return np.nan_to_num(on_stat_)
+        data = [self.counts, self.counts_off, self.alpha, self.npred_sig()]
+        n_on, n_off, alpha, mu_sig = [
+            np.asarray(_.data, dtype=float).ravel() for _ in data
+        ]
+        on_stat = wstat_cython(n_on, n_off, alpha, mu_sig)
+        return on_stat.reshape(self.counts.data.shape)
+
+    def stat_sum(self):
+        """Total likelihood given the current model parameters."""
+        return Dataset.stat_sum(self)
 
     def fake(self, background_model, random_state="random-seed"):
         """Simulate fake counts for the current model and reduced irfs.
@@ -983,17 +1112,18 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         """
         random_state = get_random_state(random_state)
 
-        npred = self.npred_sig()
-        npred.data = random_state.poisson(npred.data)
-
-        npred_bkg = background_model.evaluate().copy()
-        npred_bkg.data = random_state.poisson(npred_bkg.data)
+        npred_bkg = background_model.evaluate().data
+        npred_off = npred_bkg / self.alpha.data
 
-        self.counts = npred + npred_bkg
+        # a single draw consumes the random state in the same order as drawing
+        # the signal, background and off counts one after the other
+        lam = np.stack([self.npred_sig().data, npred_bkg, npred_off])
+        counts_sig, counts_bkg, counts_off = random_state.poisson(lam)
 
-        npred_off = background_model.evaluate() / self.alpha
-        npred_off.data = random_state.poisson(npred_off.data)
-        self.counts_off = npred_off
+        geom = self._geom
+        counts = (counts_sig + counts_bkg).astype(float)
+        self.counts = RegionNDMap.from_geom(geom, data=counts)
+        self.counts_off = RegionNDMap.from_geom(geom, data=counts_off)
 
     @classmethod
     def create(
@@ -1036,11 +1166,11 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         )
 
         counts_off = dataset.counts.copy()
-        acceptance = RegionNDMap.from_geom(counts_off.geom, dtype=int)
-        acceptance.data += 1
+        geom = counts_off.geom
 
-        acceptance_off = RegionNDMap.from_geom(counts_off.geom, dtype=int)
-        acceptance_off.data += 1
+        data = np.ones(geom.data_shape, dtype=int)
+        acceptance = RegionNDMap.from_geom(geom, data=data)
+        acceptance_off = RegionNDMap.from_geom(geom, data=data.copy())
 
         return cls.from_spectrum_dataset(
             dataset=dataset,
@@ -1161,32 +1291,45 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         if not self._is_stackable() or not other._is_stackable():
             raise ValueError("Cannot stack incomplete SpectrumDatsetOnOff.")
 
+        alpha, other_alpha = self.alpha.data, other.alpha.data
         geom = self.counts.geom
-        total_off = RegionNDMap.from_geom(geom)
-        total_alpha = RegionNDMap.from_geom(geom)
 
-        total_off.stack(self.counts_off, weights=self.mask_safe)
-        total_off.stack(other.counts_off, weights=other.mask_safe)
+        # OFF counts within the safe range, the products are evaluated
+        # in place to avoid intermediate maps
+        total_off = np.multiply(
+            self.counts_off.data, self.mask_safe.data, dtype=float
+        )
+        other_off = np.multiply(
+            other.counts_off.data, other.mask_safe.data, dtype=float
+        )
 
-        total_alpha.stack(self.alpha * self.counts_off, weights=self.mask_safe)
-        total_alpha.stack(other.alpha * other.counts_off, weights=other.mask_safe)
+        total_alpha = np.multiply(alpha, total_off)
+        np.add(total_off, other_off, out=total_off)
+        np.multiply(other_alpha, other_off, out=other_off)
+        np.add(total_alpha, other_off, out=total_alpha)
 
         with np.errstate(divide="ignore", invalid="ignore"):
-            acceptance_off = total_off / total_alpha
-            average_alpha = total_alpha.data.sum() / total_off.data.sum()
+            average_alpha = total_alpha.sum() / total_off.sum()
 
-        # For the bins where the stacked OFF counts equal 0, the alpha value is performed by weighting on the total
-        # OFF counts of each run
-        is_zero = total_off.data == 0
-        acceptance_off.data[is_zero] = 1 / average_alpha
+            # For the bins where the stacked OFF counts equal 0, the alpha value is
+            # performed by weighting on the total OFF counts of each run
+            acceptance_off = np.full_like(total_off, 1 / average_alpha)
+            np.divide(total_off, total_alpha, out=acceptance_off, where=total_off != 0)
 
         self.acceptance = RegionNDMap.from_geom(geom)
         self.acceptance.data += 1
-        self.acceptance_off = acceptance_off
+        self.acceptance_off = RegionNDMap.from_geom(geom, data=acceptance_off)
 
         if self.counts_off is not None:
-            self.counts_off *= self.mask_safe
-            self.counts_off.stack(other.counts_off, weights=other.mask_safe)
+            counts_off = self.counts_off.data.astype(float, copy=False)
+            self.counts_off.data = counts_off
+            np.multiply(counts_off, self.mask_safe.data, out=counts_off)
+            np.add(
+                counts_off,
+                other.counts_off.data,
+                out=counts_off,
+                where=other.mask_safe.data,
+            )
 
         super().stack(other)
 
@@ -1223,11 +1366,22 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         arffile = phafile.replace("pha", "arf")
         rmffile = phafile.replace("pha", "rmf")
 
+        energy_axis = self.counts.geom.axes[0]
+
+        hdu_format = "ogip-sherpa" if use_sherpa else "ogip"
+
+        # columns, meta data and HDUs shared by the PHA and BKG files
+        quality = np.logical_not(self.mask_safe.data[:, 0, 0]).astype(np.int16)
+        areascal = np.ones(self.acceptance.data.size, dtype=np.float32)
+        ogip_meta = self._ogip_meta()
+        primary_hdu = fits.PrimaryHDU()
+        ebounds_hdu = energy_axis.to_table_hdu(format=hdu_format)
+
         counts_table = self.counts.to_table()
-        counts_table["QUALITY"] = np.logical_not(self.mask_safe.data[:, 0, 0])
+        counts_table["QUALITY"] = quality
         counts_table["BACKSCAL"] = self.acceptance.data[:, 0, 0]
-        counts_table["AREASCAL"] = np.ones(self.acceptance.data.size)
-        meta = self._ogip_meta()
+        counts_table["AREASCAL"] = areascal
+        meta = ogip_meta.copy()
 
         meta["respfile"] = rmffile
         meta["backfile"] = bkgfile
@@ -1238,13 +1392,7 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         name = counts_table.meta["name"]
         hdu = fits.BinTableHDU(counts_table, name=name)
 
-        energy_axis = self.counts.geom.axes[0]
-
-        hdu_format = "ogip-sherpa" if use_sherpa else "ogip"
-
-        hdulist = fits.HDUList(
-            [fits.PrimaryHDU(), hdu, energy_axis.to_table_hdu(format=hdu_format)]
-        )
+        hdulist = fits.HDUList([primary_hdu, hdu, ebounds_hdu])
 
         if self.gti is not None:
             hdu = fits.BinTableHDU(self.gti.table, name="GTI")
@@ -1268,18 +1416,16 @@ class SpectrumDatasetOnOff(SpectrumDataset):
 
         if self.counts_off is not None:
             counts_off_table = self.counts_off.to_table()
-            counts_off_table["QUALITY"] = np.logical_not(self.mask_safe.data[:, 0, 0])
+            counts_off_table["QUALITY"] = quality
             counts_off_table["BACKSCAL"] = self.acceptance_off.data[:, 0, 0]
-            counts_off_table["AREASCAL"] = np.ones(self.acceptance.data.size)
-            meta = self._ogip_meta()
+            counts_off_table["AREASCAL"] = areascal
+            meta = ogip_meta.copy()
             meta["hduclas2"] = "BKG"
 
             counts_off_table.meta = meta
             name = counts_off_table.meta["name"]
             hdu = fits.BinTableHDU(counts_off_table, name=name)
-            hdulist = fits.HDUList(
-                [fits.PrimaryHDU(), hdu, energy_axis.to_table_hdu(format=hdu_format)]
-            )
+            hdulist = fits.HDUList([primary_hdu, hdu, ebounds_hdu])
             if (
                 self.counts_off.geom._region is not None
                 and self.counts_off.geom.wcs is not None
@@ -1344,9 +1490,8 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         dirname = filename.parent
 
         with fits.open(str(filename), memmap=False) as hdulist:
-            counts = RegionNDMap.from_hdulist(hdulist, format="ogip")
-            acceptance = RegionNDMap.from_hdulist(
-                hdulist, format="ogip", ogip_column="BACKSCAL"
+            counts, acceptance, mask_safe = RegionNDMap.from_hdulist_columns(
+                hdulist, ogip_columns=["COUNTS", "BACKSCAL", "QUALITY"]
             )
             livetime = counts.meta["EXPOSURE"] * u.s
 
@@ -1355,9 +1500,6 @@ class SpectrumDatasetOnOff(SpectrumDataset):
             else:
                 gti = None
 
-            mask_safe = RegionNDMap.from_hdulist(
-                hdulist, format="ogip", ogip_column="QUALITY"
-            )
             mask_safe.data = np.logical_not(mask_safe.data)
 
         phafile = filename.name
@@ -1374,9 +1516,8 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         try:
             bkgfile = phafile.replace("pha", "bkg")
             with fits.open(str(dirname / bkgfile), memmap=False) as hdulist:
-                counts_off = RegionNDMap.from_hdulist(hdulist, format="ogip")
-                acceptance_off = RegionNDMap.from_hdulist(
-                    hdulist, ogip_column="BACKSCAL"
+                counts_off, acceptance_off = RegionNDMap.from_hdulist_columns(
+                    hdulist, ogip_columns=["COUNTS", "BACKSCAL"]
                 )
         except OSError:
             # TODO : Add logger and echo warning
@@ -1416,13 +1557,13 @@ class SpectrumDatasetOnOff(SpectrumDataset):
             Dictionary with summary info.
         """
         info = super().info_dict(in_safe_energy_range)
-        mask = self.mask_safe.data if in_safe_energy_range else slice(None)
+        mask = self.mask_safe.data if in_safe_energy_range else True
 
         # TODO: handle energy dependent a_on / a_off
         info["a_on"] = self.acceptance.data[0, 0, 0].copy()
 
         if self.counts_off is not None:
-            info["n_off"] = self.counts_off.data[mask].sum()
+            info["n_off"] = np.sum(self.counts_off.data, where=mask)
             info["a_off"] = self.acceptance_off.data[0, 0, 0].copy()
         else:
             info["n_off"] = 0
@@ -1430,9 +1571,7 @@ class SpectrumDatasetOnOff(SpectrumDataset):
 
         info["alpha"] = self.alpha.data[0, 0, 0].copy()
         info["significance"] = WStatCountsStatistic(
-            self.counts.data[mask].sum(),
-            self.counts_off.data[mask].sum(),
-            self.alpha.data[0, 0, 0],
+            info["n_on"], info["n_off"], info["alpha"],
         ).significance
         return info
 
@@ -1508,8 +1647,9 @@ class SpectrumDatasetOnOff(SpectrumDataset):
 
         """
         if counts_off is None and dataset.background_model is not None:
-            alpha = acceptance / acceptance_off
-            counts_off = dataset.background_model.evaluate() / alpha
+            counts_off = dataset.background_model.evaluate() * (
+                acceptance_off / acceptance
+            )
 
         return cls(
             models=dataset.models,
@@ -1517,7 +1657,7 @@ class SpectrumDatasetOnOff(SpectrumDataset):
             exposure=dataset.exposure,
             counts_off=counts_off,
             edisp=dataset.edisp,
-            mask_safe=dataset.mask_safe,
+            mask_safe=dataset._mask_safe,
             mask_fit=dataset.mask_fit,
             acceptance=acceptance,
             acceptance_off=acceptance_off,
@@ -1552,7 +1692,7 @@ class SpectrumDatasetOnOff(SpectrumDataset):
             name=name,
             gti=self.gti,
             mask_fit=self.mask_fit,
-            mask_safe=self.mask_safe,
+            mask_safe=self._mask_safe,
             models=background_model,
             meta_table=self.meta_table,
         )
@@ -1589,8 +1729,8 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         if self.edisp is not None:
             kwargs["edisp"] = self.edisp.slice_by_idx(slices=slices)
 
-        if self.mask_safe is not None:
-            kwargs["mask_safe"] = self.mask_safe.slice_by_idx(slices=slices)
+        if self._mask_safe is not None:
+            kwargs["mask_safe"] = self._mask_safe.slice_by_idx(slices=slices)
 
         if self.mask_fit is not None:
             kwargs["mask_fit"] = self.mask_fit.slice_by_idx(slices=slices)
@@ -1621,19 +1761,33 @@ class SpectrumDatasetOnOff(SpectrumDataset):
 
         axis = dataset.counts.geom.axes["energy"]
 
+        # the bin indices and weights are shared by all resampled maps
+        indices = self._geom.axes["energy"].coord_to_idx(axis.edges[:-1])
+        resample_kwargs = {
+            "name": "energy",
+            "indices": indices,
+            "weights": self.mask_safe,
+        }
+
         counts_off = None
         if self.counts_off is not None:
-            counts_off = self.counts_off
-            counts_off = counts_off.resample_axis(axis=axis, weights=self.mask_safe)
+            counts_off = self.counts_off._resample_axis(
+                geom=self.counts_off.geom.resample_axis(axis), **resample_kwargs
+            )
 
         acceptance = 1
         acceptance_off = None
         if self.acceptance is not None:
-            acceptance = self.acceptance
-            acceptance = acceptance.resample_axis(axis=axis, weights=self.mask_safe)
+            geom = self.acceptance.geom
+            geom_resampled = geom.resample_axis(axis)
+            acceptance = self.acceptance._resample_axis(
+                geom=geom_resampled, **resample_kwargs
+            )
 
-            background = self.alpha * self.counts_off
-            background = background.resample_axis(axis=axis, weights=self.mask_safe)
+            data = np.multiply(self.alpha.data, self.counts_off.data)
+            background = RegionNDMap.from_geom(geom, data=data)._resample_axis(
+                geom=geom_resampled, **resample_kwargs
+            )
 
             acceptance_off = acceptance * counts_off / background
 
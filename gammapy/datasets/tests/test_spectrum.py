@@ -3,6 +3,7 @@ import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
+from astropy.io import fits
 from astropy.table import Table
 from astropy.time import Time
 from gammapy.data import GTI
@@ -73,15 +74,35 @@ def test_data_shape(spectrum_dataset):
     assert spectrum_dataset.data_shape[0] == 30
 
 
+def test_mask_safe_default(spectrum_dataset):
+    mask_safe = spectrum_dataset.mask_safe
+    assert mask_safe.data.all()
+    assert not mask_safe.data.flags.writeable
+
+    other = spectrum_dataset.copy()
+    other.mask_safe = mask_safe.copy(data=np.zeros(mask_safe.data.shape, dtype=bool))
+    spectrum_dataset.stack(other)
+    assert spectrum_dataset.mask_safe.data.all()
+
+
 def test_str(spectrum_dataset):
     assert "SpectrumDataset" in str(spectrum_dataset)
 
+    dataset = SpectrumDataset(counts=spectrum_dataset.counts.copy())
+    assert "Exposure min                    : nan" in str(dataset)
+
 
 def test_energy_range(spectrum_dataset):
     energy_range = spectrum_dataset.energy_range
     assert energy_range.unit == u.TeV
     assert_allclose(energy_range.to_value("TeV"), [0.1, 10.0])
 
+    mask_safe = np.zeros(spectrum_dataset.data_shape, dtype=bool)
+    mask_safe[5:15] = True
+    spectrum_dataset.mask_safe = spectrum_dataset.counts.copy(data=mask_safe)
+    energy_range = spectrum_dataset.energy_range
+    assert_allclose(energy_range.to_value("TeV"), [0.215443, 1.0], rtol=1e-5)
+
 
 def test_info_dict(spectrum_dataset):
     info_dict = spectrum_dataset.info_dict()
@@ -115,6 +136,15 @@ def test_set_model(spectrum_dataset):
     spectrum_dataset.models = models
     assert spectrum_dataset.models["test"] is model
 
+    assert spectrum_dataset.models is spectrum_dataset.models
+
+    other = SkyModel(spectral_model=PowerLawSpectralModel(), name="other")
+    spectrum_dataset.models.append(other)
+    assert spectrum_dataset.models.names == ["test", "other"]
+
+    other.datasets_names = ["not-this-dataset"]
+    assert spectrum_dataset.models.names == ["test"]
+
 
 def test_npred_models():
     e_reco = MapAxis.from_energy_bounds("1 TeV", "10 TeV", nbin=3)
@@ -138,6 +168,48 @@ def test_npred_models():
     assert_allclose(npred_sig_model1.data.sum(), 32.4)
 
 
+def test_npred_cache():
+    e_reco = MapAxis.from_energy_bounds("1 TeV", "10 TeV", nbin=3)
+    spectrum_dataset = SpectrumDataset.create(e_reco=e_reco)
+    spectrum_dataset.exposure.quantity = 1e10 * u.Unit("cm2 h")
+
+    pwl = PowerLawSpectralModel(index=2)
+    spectrum_dataset.models = SkyModel(spectral_model=pwl)
+
+    npred = spectrum_dataset.npred()
+    assert_allclose(npred.data.sum(), 32.4)
+
+    # modifying the returned map must not affect the cached value
+    npred.data *= 2
+    assert_allclose(spectrum_dataset.npred().data.sum(), 32.4)
+
+    pwl.amplitude.value *= 2
+    assert_allclose(spectrum_dataset.npred().data.sum(), 64.8)
+
+    other = SkyModel(spectral_model=PowerLawSpectralModel())
+    evaluator = spectrum_dataset.evaluators[spectrum_dataset.models[0]]
+    spectrum_dataset.models.append(other)
+    assert_allclose(spectrum_dataset.npred().data.sum(), 97.2)
+    assert spectrum_dataset.evaluators[spectrum_dataset.models[0]] is evaluator
+
+    other.datasets_names = ["not-this-dataset"]
+    assert other not in spectrum_dataset.evaluators
+    assert_allclose(spectrum_dataset.npred().data.sum(), 64.8)
+
+    # a failed evaluation must not be cached as the prediction for new values
+    def compute_npred():
+        raise ValueError("evaluation failed")
+
+    evaluator.compute_npred = compute_npred
+    pwl.amplitude.value *= 2
+
+    with pytest.raises(ValueError):
+        spectrum_dataset.npred()
+
+    del evaluator.compute_npred
+    assert_allclose(spectrum_dataset.npred().data.sum(), 129.6)
+
+
 @requires_dependency("iminuit")
 def test_fit(spectrum_dataset):
     """Simple CASH fit to the on vector"""
@@ -159,6 +231,26 @@ def test_fit(spectrum_dataset):
     assert_allclose(pars["amplitude"].error, 139.61, rtol=1e-2)
 
 
+def test_stat_sum(spectrum_dataset):
+    stat = np.sum(spectrum_dataset.stat_array(), dtype=np.float64)
+    assert spectrum_dataset.stat_sum() == stat
+
+    spectrum_dataset.mask_safe = spectrum_dataset.counts.copy(
+        data=np.zeros(spectrum_dataset.data_shape, dtype=bool)
+    )
+    spectrum_dataset.mask_safe.data[5:15] = True
+    stat = spectrum_dataset.stat_array()[spectrum_dataset.mask.data]
+    assert_allclose(spectrum_dataset.stat_sum(), stat.sum(), rtol=1e-6)
+
+    spectrum_dataset.fake(random_state=42)
+    stat = spectrum_dataset.stat_array()[spectrum_dataset.mask.data]
+    assert_allclose(spectrum_dataset.stat_sum(), stat.sum(), rtol=1e-6)
+
+    spectrum_dataset.counts.data[:] = 0
+    stat = spectrum_dataset.stat_array()[spectrum_dataset.mask.data]
+    assert_allclose(spectrum_dataset.stat_sum(), stat.sum(), rtol=1e-6)
+
+
 def test_spectrum_dataset_create():
     e_reco = MapAxis.from_edges(u.Quantity([0.1, 1, 10.0], "TeV"), name="energy")
     e_true = MapAxis.from_edges(
@@ -306,6 +398,17 @@ def test_spectrum_dataset_stack_nondiagonal_no_bkg(spectrum_dataset):
     assert_allclose(kernel.get_resolution(1 * u.TeV), 0.1581, atol=1e-2)
 
 
+def test_spectrum_dataset_stack_integer_counts(spectrum_dataset):
+    dataset = spectrum_dataset.copy()
+    dataset.counts.data = dataset.counts.data.astype(int)
+    other = spectrum_dataset.copy()
+    other.counts.data = other.counts.data.astype(float)
+
+    dataset.stack(other)
+    assert dataset.counts.data.dtype == float
+    assert_allclose(dataset.counts.data, 2 * spectrum_dataset.counts.data)
+
+
 @requires_dependency("matplotlib")
 def test_peek(spectrum_dataset):
     with mpl_plot_check():
@@ -319,6 +422,19 @@ def test_peek(spectrum_dataset):
         spectrum_dataset.peek()
 
 
+@requires_dependency("matplotlib")
+def test_plot_residuals(spectrum_dataset):
+    with mpl_plot_check():
+        ax = spectrum_dataset.plot_residuals()
+
+    residuals = spectrum_dataset.residuals().data.ravel()
+    yerr = np.sqrt(spectrum_dataset.counts.data + spectrum_dataset.npred().data)
+    yerr = yerr.ravel()
+    ymin, ymax = ax.get_ylim()
+    assert_allclose(ymin, 1.05 * np.min(residuals - yerr), rtol=1e-5)
+    assert_allclose(ymax, 1.05 * np.max(residuals + yerr), rtol=1e-5)
+
+
 class TestSpectrumOnOff:
     """ Test ON OFF SpectrumDataset"""
 
@@ -415,10 +531,41 @@ class TestSpectrumOnOff:
         stacked.stack(self.dataset)
         assert_allclose(stacked.energy_range.value, self.dataset.energy_range.value)
 
+    def test_stack_integer_counts_off(self):
+        dataset = self.dataset.copy()
+        dataset.counts_off.data = dataset.counts_off.data.astype(int)
+
+        dataset.stack(self.dataset)
+        assert dataset.counts_off.data.dtype == float
+        assert_allclose(dataset.counts_off.data, 20)
+
     def test_alpha(self):
         assert self.dataset.alpha.data.shape == (4, 1, 1)
         assert_allclose(self.dataset.alpha.data, 0.1)
 
+    def test_excess(self):
+        excess = self.dataset.excess
+        assert excess.geom == self.dataset.counts.geom
+        assert_allclose(excess.data.squeeze(), [0, 0, 0, -1], atol=1e-12)
+
+        counts_off_normalised = self.dataset.counts_off_normalised
+        assert_allclose(counts_off_normalised.data.squeeze(), 1)
+
+    def test_alpha_update(self):
+        dataset = self.dataset.copy()
+
+        dataset.acceptance_off = dataset.acceptance_off * 2
+        assert_allclose(dataset.alpha.data, 0.05)
+
+        dataset.acceptance.data *= 2
+        assert_allclose(dataset.alpha.data, 0.1)
+
+        dataset.acceptance_off.data[0] = 0
+        assert_allclose(dataset.alpha.data[0], np.finfo(float).max)
+
+        dataset.acceptance.data[0] = 0
+        assert_allclose(dataset.alpha.data[0], 0)
+
     def test_npred_no_edisp(self):
         const = 1 * u.Unit("cm-2 s-1 TeV-1")
         model = SkyModel(spectral_model=ConstantSpectralModel(const=const))
@@ -473,9 +620,18 @@ class TestSpectrumOnOff:
 
     def test_to_from_ogip_files(self, tmp_path):
         dataset = self.dataset.copy(name="test")
+        dataset.mask_safe = RegionNDMap.from_geom(dataset.counts.geom, dtype=bool)
+        dataset.mask_safe.data[1:] = True
         dataset.to_ogip_files(outdir=tmp_path)
         newdataset = SpectrumDatasetOnOff.from_ogip_files(tmp_path / "pha_obstest.fits")
 
+        with fits.open(tmp_path / "pha_obstest.fits") as hdulist:
+            columns = hdulist["SPECTRUM"].columns
+            assert columns["QUALITY"].format == "I"
+            assert columns["AREASCAL"].format == "E"
+
+        assert_allclose(newdataset.mask_safe.data, dataset.mask_safe.data)
+
         expected_regions = compound_region_to_list(self.off_counts.geom.region)
         regions = compound_region_to_list(newdataset.counts_off.geom.region)
 
@@ -564,6 +720,32 @@ class TestSpectrumOnOff:
         assert real_dataset.counts_off.data.shape == dataset.counts_off.data.shape
         assert dataset.counts_off.data.sum() == 39
         assert dataset.counts.data.sum() == 5
+        assert dataset.counts.data.dtype == float
+
+        dataset.stack(SpectrumDatasetOnOff.create(self.e_reco, self.e_true))
+        assert dataset.counts.data.sum() == 5
+
+    def test_fake_no_off_acceptance(self):
+        dataset = SpectrumDatasetOnOff(
+            name="test",
+            counts=self.on_counts,
+            counts_off=self.off_counts,
+            models=SkyModel(spectral_model=PowerLawSpectralModel()),
+            exposure=self.aeff * self.livetime,
+            edisp=self.edisp,
+            acceptance=1,
+            acceptance_off=0,
+        )
+
+        background = RegionNDMap.from_geom(dataset.counts.geom)
+        background.data += 1
+        background_model = BackgroundModel(
+            background, name="test-bkg", datasets_names="test"
+        )
+        dataset.fake(background_model=background_model, random_state=314)
+
+        assert dataset.counts_off.data.sum() == 0
+        assert np.isfinite(dataset.stat_sum())
 
     def test_info_dict(self):
         info_dict = self.dataset.info_dict()
@@ -477,7 +477,26 @@ class Map(abc.ABC):
         axis_resampled = geom.axes[axis.name]
 
         indices = axis_self.coord_to_idx(axis_resampled.edges[:-1])
-        idx = self.geom.axes.index_data(axis.name)
+        return self._resample_axis(
+            geom=geom, name=axis.name, indices=indices, weights=weights, ufunc=ufunc
+        )
+
+    def _resample_axis(self, geom, name, indices, weights=None, ufunc=np.add):
+        """Resample map axis given the resampled geometry and the bin start indices.
+
+        This allows to share the index computation when resampling several maps
+        with the same geometry, see `Map.resample_axis` for the other parameters.
+
+        Parameters
+        ----------
+        geom : `Geom`
+            Resampled geometry.
+        name : str
+            Name of the resampled axis.
+        indices : `~numpy.ndarray`
+            Index of the first bin of the map contributing to each resampled bin.
+        """
+        idx = self.geom.axes.index_data(name)
 
         weights = 1 if weights is None else weights.data
 
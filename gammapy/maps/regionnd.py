@@ -299,20 +299,50 @@ class RegionNDMap(Map):
         region_nd_map : `RegionNDMap`
             Region map.
         """
+        if format == "ogip-arf":
+            ogip_column = "SPECRESP"
+
+        return cls.from_hdulist_columns(hdulist, format, ogip_columns=[ogip_column])[0]
+
+    @classmethod
+    def from_hdulist_columns(cls, hdulist, format="ogip", ogip_columns=("COUNTS",)):
+        """Create one region map per column from `~astropy.io.fits.HDUList`.
+
+        The table and the region geometry are read once and shared by all maps.
+
+        Parameters
+        ----------
+        hdulist : `~astropy.io.fits.HDUList`
+            HDU list.
+        format : {"ogip", "ogip-arf"}
+            Format specification
+        ogip_columns : list of str
+            OGIP data format columns
+
+        Returns
+        -------
+        region_nd_maps : list of `RegionNDMap`
+            Region maps, one per column.
+        """
         if format == "ogip":
             hdu = "SPECTRUM"
         elif format == "ogip-arf":
             hdu = "SPECRESP"
-            ogip_column = "SPECRESP"
         else:
             raise ValueError(f"Unknown format: {format}")
 
         table = Table.read(hdulist[hdu])
         geom = RegionGeom.from_hdulist(hdulist, format=format)
 
-        data = table[ogip_column].quantity
+        maps = []
+        for ogip_column in ogip_columns:
+            data = table[ogip_column].quantity
+            region_map = cls(
+                geom=geom, data=data.value, meta=table.meta.copy(), unit=data.unit
+            )
+            maps.append(region_map)
 
-        return cls(geom=geom, data=data.value, meta=table.meta, unit=data.unit)
+        return maps
 
     def crop(self):
         raise NotImplementedError("Crop is not supported by RegionNDMap")
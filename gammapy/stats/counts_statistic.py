@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import abc
+import math
 import numpy as np
 from scipy.optimize import brentq, newton
 from scipy.stats import chi2
@@ -215,6 +216,35 @@ class WStatCountsStatistic(CountsStatistic):
         else:
             self.mu_sig = np.asanyarray(mu_sig)
 
+    @property
+    def significance(self):
+        """Return statistical significance of measured excess."""
+        scalar = self.n_on.ndim == self.n_off.ndim == self.alpha.ndim == 0
+
+        if scalar and self.mu_sig.ndim == 0 and self.mu_sig == 0 and self.alpha > 0:
+            return self._significance_scalar()
+
+        return super().significance
+
+    def _significance_scalar(self):
+        """Significance for scalar counts and no expected signal.
+
+        Evaluated from the closed form of the TS difference (Li & Ma 1983, eq. 17),
+        without the array overhead of the general computation.
+        """
+        n_on, n_off, alpha = float(self.n_on), float(self.n_off), float(self.alpha)
+        n_total = n_on + n_off
+        delta_ts = 0.0
+
+        if n_on > 0:
+            delta_ts += n_on * math.log((1 + alpha) / alpha * n_on / n_total)
+
+        if n_off > 0:
+            delta_ts += n_off * math.log((1 + alpha) * n_off / n_total)
+
+        excess = n_on - alpha * n_off
+        return np.sign(excess) * math.sqrt(max(2 * delta_ts, 0))
+
     @property
     def background(self):
         mu_bkg = self.alpha * get_wstat_mu_bkg(
@@ -109,6 +109,25 @@ def test_wstat_basic(n_on, n_off, alpha, result):
     assert_allclose(p_value, result[2], rtol=1e-4)
 
 
+@pytest.mark.parametrize(
+    ("n_on", "n_off", "alpha"),
+    [
+        (1, 2, 1),
+        (5, 1, 1),
+        (10, 5, 0.3),
+        (0, 5, 0.5),
+        (7, 0, 0.2),
+        (0, 0, 1),
+        (3, 4, 0),
+    ],
+)
+def test_wstat_significance_scalar(n_on, n_off, alpha):
+    significance = WStatCountsStatistic(n_on, n_off, alpha).significance
+    desired = WStatCountsStatistic([n_on], [n_off], [alpha]).significance
+    assert np.isscalar(significance)
+    assert_allclose(significance, desired[0], rtol=1e-10)
+
+
 values = [
     (5, 1, 1, 3, [1, 0.422261, 0.672834, 0.178305]),
     (5, 1, 1, 1, [3.0, 1.29828, 0.19419, 1.685535]),
@@ -118,6 +118,20 @@ def test_cash_sum_cython(test_data):
     assert_allclose(stat, ref)
 
 
+def test_wstat_cython(test_data):
+    n_on = np.array(test_data["n_on"], dtype=float)
+    n_off = np.array(test_data["n_off"], dtype=float)
+    alpha = np.array(test_data["alpha"], dtype=float)
+    mu_sig = np.array(test_data["mu_sig"], dtype=float)
+
+    stat = stats.wstat_cython(n_on=n_on, n_off=n_off, alpha=alpha, mu_sig=mu_sig)
+    ref = np.nan_to_num(stats.wstat(n_on, n_off, alpha, mu_sig))
+    assert_allclose(stat, ref)
+
+    with pytest.raises(ValueError):
+        stats.wstat_cython(n_on, n_off[:1], alpha[:1], mu_sig)
+
+
 def test_wstat_corner_cases():
     """test WSTAT formulae for corner cases"""
     n_on = 0